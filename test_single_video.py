@@ -5,9 +5,6 @@ Run this first to check video quality before full automation
 import json
 import os
 from youtube_automation import YouTubeAutomation
-from moviepy.editor import AudioClip
-import numpy as np
-from moviepy.audio.AudioClip import AudioArrayClip
 
 def test_single_video():
     """Generate a single test video"""
@@ -62,29 +59,12 @@ def test_single_video():
     if not audio_success:
         print("❌ Failed or skipped audio. Creating silent video...")
         # Create silent audio (5 seconds) using robust method
-        duration = 5
-        silence = np.zeros((int(duration * 44100), 2))
-        silent = AudioArrayClip(silence, fps=44100)
-        silent.write_audiofile(str(audio_path), fps=44100)
+        automation.write_silent_audio(audio_path, duration=5)
     
     # Create video
-    print(f"\n🎥 Creating video...")
-    video = automation.create_video(test_content, audio_path, scheme)
-    
-    # Save video
     video_path = automation.output_folder / f"TEST_day_1_{test_content['language']}.mp4"
-    print(f"\n💾 Saving video to: {video_path}")
-    
-    video.write_videofile(
-        str(video_path),
-        fps=automation.fps,
-        codec='libx264',
-        audio_codec='aac',
-        preset='medium',
-        bitrate='3000k',
-        audio_fps=44100,
-        threads=4
-    )
+    print(f"\n🎥 Creating video: {video_path}")
+    automation.create_video(test_content, audio_path, scheme, video_path, bitrate='3000k')
     
     # Generate metadata
     metadata = automation.generate_youtube_metadata(test_content)
@@ -36,18 +36,17 @@ def test_visuals():
     scheme = automation.generate_dynamic_theme("Test")
     print(f"🎨 Theme: {scheme}")
     
+    output_path = "output/test_visuals.mp4"
+    
     print("🎥 Rendering Test Video...")
-    video = automation.create_video(day_data, "mock_audio_path_will_fail_but_handled", scheme)
+    automation.create_video(day_data, "mock_audio_path_will_fail_but_handled", scheme, output_path)
     
     # We need to manually set duration because the mock audio path isn't real and create_video handles it
     # But wait, create_video attempts to load audio. Let's create a real silent audio file.
     silent_clip = AudioArrayClip(silence, fps=44100)
     silent_clip.write_audiofile(audio_path, fps=44100)
     
-    video = automation.create_video(day_data, audio_path, scheme)
-    
-    output_path = "output/test_visuals.mp4"
-    video.write_videofile(output_path, fps=15, codec='libx264', audio_codec='aac')
+    automation.create_video(day_data, audio_path, scheme, output_path)
     
     print(f"✅ Video generated at {output_path}")
 
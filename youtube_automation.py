@@ -9,15 +9,29 @@ if hasattr(sys.stderr, 'reconfigure'):
     sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import time
+import hashlib
+import shutil
+import subprocess
 from pathlib import Path
-from moviepy.editor import VideoClip, AudioFileClip, AudioClip
+from moviepy.editor import AudioFileClip
+from moviepy.config import get_setting
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 import random
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import OrderedDict, deque
 
 import math
+import re
+import colorsys
+import functools
+import threading
+import queue
+import multiprocessing
 
 try:
     from pygments import lex
@@ -27,12 +41,283 @@ try:
 except ImportError:
     HAS_PYGMENTS = False
 
+try:
+    from mutagen import MutagenError
+    from mutagen.mp3 import MP3
+    HAS_MUTAGEN = True
+except ImportError:
+    HAS_MUTAGEN = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import numba
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 # Google API imports
 import google.oauth2.credentials
 import google_auth_oauthlib.flow
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 
+@njit(parallel=True, cache=True)
+def _blend_layer(region, src, inv_alpha):
+    """Per-pixel form of the NumPy blend in blend_card, split across cores by row."""
+    for i in prange(region.shape[0]):
+        for j in range(region.shape[1]):
+            a = inv_alpha[i, j, 0]
+            for c in range(3):
+                t = region[i, j, c] * a + src[i, j, c] + 128
+                region[i, j, c] = (t + (t >> 8)) >> 8
+
+@njit(cache=True)
+def _advance_typewriter(chars_per_frame, n_frames, line_lengths):
+    """Typing state for every frame as (lines started, chars shown on the last started line)."""
+    states = np.zeros((n_frames, 2), dtype=np.int64)
+    current_line = 0
+    current_char = 0.0
+    started = 0
+    typed = 0
+    for frame_num in range(n_frames):
+        if current_line < len(line_lengths):
+            if int(current_char) <= line_lengths[current_line]:
+                started = current_line + 1
+                typed = int(current_char)
+                current_char += chars_per_frame
+            else:
+                current_line += 1
+                current_char = 0.0
+        states[frame_num, 0] = started
+        states[frame_num, 1] = typed
+    return states
+
+# Glyph rasters and widths, keyed by (text, font). Line numbers, keywords and already-typed
+# code repeat on every code card, so FreeType only shapes each string once per process
+@functools.lru_cache(maxsize=4096)
+def render_text_mask(text, font, pad=4):
+    """Coverage mask of `text`, drawn at (pad, pad). Returns (mask, pad)."""
+    bbox = font.getbbox(text)
+    mask = Image.new('L', (max(1, bbox[2]) + 2 * pad, max(1, bbox[3]) + 2 * pad), 0)
+    ImageDraw.Draw(mask).text((pad, pad), text, fill=255, font=font)
+    return mask, pad
+
+GLOW_OFFSETS = ((2, 2), (-2, 2), (2, -2), (-2, -2), (3, 3), (-3, -3))
+
+@functools.lru_cache(maxsize=4096)
+def render_glow_mask(text, font):
+    """The six offset glow stamps of `text` merged into one mask. Returns (mask, pad).
+    draw.bitmap lerps every channel towards the fill by the mask coverage, so k stacked
+    stamps of one fill equal a single stamp with coverage 1 - prod(1 - m_i)."""
+    mask, pad = render_text_mask(text, font)
+    m = np.asarray(mask, dtype=np.float32) / 255
+    reach = max(max(abs(dx), abs(dy)) for dx, dy in GLOW_OFFSETS)
+    h, w = m.shape
+    keep = np.ones((h + 2 * reach, w + 2 * reach), dtype=np.float32)
+    for dx, dy in GLOW_OFFSETS:
+        keep[reach + dy:reach + dy + h, reach + dx:reach + dx + w] *= 1 - m
+    glow = np.rint((1 - keep) * 255).astype(np.uint8)
+    return Image.fromarray(glow, 'L'), pad + reach
+
+@functools.lru_cache(maxsize=16384)
+def measure_text_bbox(text, font, fontmode='L'):
+    """Same as draw.textbbox((0, 0), ...) on a draw with the given fontmode."""
+    draw = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+    draw.fontmode = fontmode
+    return draw.textbbox((0, 0), text, font=font)
+
+def measure_text_bbox_width(text, font, fontmode='L'):
+    bbox = measure_text_bbox(text, font, fontmode)
+    return bbox[2] - bbox[0]
+
+def parse_json(text):
+    """json.loads, through orjson when it is installed (its errors subclass json.JSONDecodeError)."""
+    return orjson.loads(text) if HAS_ORJSON else json.loads(text)
+
+# Description sanitizing for YouTube, compiled once: URL-like tokens (these may contain '<' or '>',
+# so they go first), then tags and stray special characters in one pass, then spacing in one pass
+DESCRIPTION_URL_RE = re.compile(r'https?://[^\s]+')
+DESCRIPTION_WWW_RE = re.compile(r'www\.[^\s]+')
+DESCRIPTION_MARKUP_RE = re.compile(r'<[^>]*>|[<>{}|\[\]\\^`]')
+DESCRIPTION_SPACING_RE = re.compile(r'( +)|\n{3,}')
+
+# Outermost {...} of a model reply, with or without ```json fences around it
+JSON_BLOCK_RE = re.compile(r'\{[\s\S]*\}')
+
+def dump_json_pretty(data):
+    """UTF-8 bytes of json.dumps(data, indent=2, ensure_ascii=False); orjson's OPT_INDENT_2 is byte-identical."""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+HW_VIDEO_CODECS = ('h264_nvenc', 'h264_qsv', 'h264_videotoolbox')
+
+@functools.lru_cache(maxsize=None)
+def detect_video_codec(ffmpeg_bin):
+    """First hardware H.264 encoder that actually opens on this machine, else libx264.
+    (`ffmpeg -encoders` only lists what was compiled in, not what has a device behind it.)"""
+    for codec in HW_VIDEO_CODECS:
+        probe = [ffmpeg_bin, '-loglevel', 'error', '-f', 'lavfi', '-i', 'color=s=256x256:d=0.1',
+                 '-frames:v', '1', '-c:v', codec, '-f', 'null', '-']
+        try:
+            if subprocess.run(probe, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=15).returncode == 0:
+                return codec
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+    return 'libx264'
+
+OUTPUT_GLOW_REACH = 8
+
+@functools.lru_cache(maxsize=16)
+def render_output_box(width, height, font):
+    """Output panel of the code card: glow rings, filled box and header, drawn at
+    (OUTPUT_GLOW_REACH, OUTPUT_GLOW_REACH). Returns (patch, mask of the pixels it sets).
+    ImageDraw overwrites RGBA pixels instead of compositing, so pasting the patch through
+    the mask gives the same pixels as drawing the rectangles onto the card."""
+    r = OUTPUT_GLOW_REACH
+    size = (width + 2 * r + 1, height + 2 * r + 1)
+    patch = Image.new('RGBA', size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(patch)
+    for offset in range(r, 0, -2):
+        alpha = 80 - offset * 10
+        draw.rounded_rectangle([r-offset, r-offset, r+width+offset, r+height+offset],
+                               radius=18, fill=(0, 255, 136, alpha))
+    draw.rounded_rectangle([r, r, r+width, r+height], radius=18, fill=(0, 50, 25, 220))
+    draw.text((r + 20, r + 15), "▶ OUTPUT:", fill='#00ff88', font=font)
+    mask = Image.new('L', size, 0)
+    ImageDraw.Draw(mask).rounded_rectangle([0, 0, width + 2 * r, height + 2 * r], radius=18, fill=255)
+    return patch, mask
+
+GLASS_BORDER = 48
+GLASS_BLUR_CONTEXT = 32
+
+@functools.lru_cache(maxsize=64)
+def render_glass_card(width, height, accent_rgb):
+    """Frosted card with a soft accent border. Cached: a video only uses a handful of sizes,
+    and a batch run only a handful of accents. Callers must copy before drawing on it."""
+    # Frosted glass fill (compositing it over a fully transparent layer is a no-op)
+    card = Image.new('RGBA', (width, height), (255, 255, 255, 25))
+    draw = ImageDraw.Draw(card)
+    for i in range(8, 0, -2):
+        alpha = int(100 - i * 10)
+        draw.rounded_rectangle([i, i, width-i, height-i], radius=25, 
+                               outline=accent_rgb + (alpha,), width=3)
+    
+    # The outlines (corners included) stay within GLASS_BORDER px of the edges and the fill is
+    # uniform, so the blur only changes that band: blur four edge strips (with GLASS_BLUR_CONTEXT
+    # px of interior so the cut never reaches the kept pixels) instead of the whole card
+    strip = GLASS_BORDER + GLASS_BLUR_CONTEXT
+    if width < 2 * strip or height < 2 * strip:
+        return card.filter(ImageFilter.GaussianBlur(3))
+    strips = [
+        ((0, 0, width, strip), (0, 0, width, GLASS_BORDER)),
+        ((0, height - strip, width, height), (0, GLASS_BLUR_CONTEXT, width, strip)),
+        ((0, 0, strip, height), (0, 0, GLASS_BORDER, height)),
+        ((width - strip, 0, width, height), (GLASS_BLUR_CONTEXT, 0, strip, height)),
+    ]
+    # Crop every strip before pasting any back, so overlapping corners are only blurred once
+    blurred = [card.crop(box).filter(ImageFilter.GaussianBlur(3)).crop(keep) for box, keep in strips]
+    for (box, keep), band in zip(strips, blurred):
+        card.paste(band, (box[0] + keep[0], box[1] + keep[1]))
+    return card
+
+if HAS_PYGMENTS:
+    # Map Pygments Token types to Hex Colors
+    # Dracular/Monokai-ish style
+    STYLE_MAP = {
+        Token.Keyword: '#ff79c6',       # Pink
+        Token.Keyword.Declaration: '#8be9fd', # Cyan (def, class)
+        Token.Keyword.Namespace: '#ff79c6',   # Pink (import)
+        Token.Name.Function: '#50fa7b', # Green
+        Token.Name.Class: '#50fa7b',    # Green
+        Token.Name.Builtin: '#8be9fd',  # Cyan
+        Token.String: '#f1fa8c',        # Yellow
+        Token.Number: '#bd93f9',        # Purple
+        Token.Operator: '#ff79c6',      # Pink
+        Token.Comment: '#6272a4',       # Grey/Blue
+        Token.Text: '#f8f8f2',          # White
+        Token.Literal: '#bd93f9',
+        Token.Punctuation: '#f8f8f2'
+    }
+
+    @functools.lru_cache(maxsize=None)
+    def get_code_lexer(language):
+        """Lexer lookup goes through Pygments' plugin registry, so resolve each language once."""
+        try:
+            return get_lexer_by_name(language)
+        except Exception:
+            return get_lexer_by_name("text")
+
+    @functools.lru_cache(maxsize=None)
+    def token_color(token_type):
+        # Find best color match (walk up the token hierarchy)
+        parent = token_type
+        while parent:
+            if parent in STYLE_MAP:
+                return STYLE_MAP[parent]
+            parent = parent.parent
+        return '#f8f8f2' # Default white
+
+# Fallback syntax highlighting (no Pygments): one compiled scan per class instead of
+# a Python-level loop over keywords/characters for every line
+FALLBACK_KEYWORDS = [
+    'print', 'def', 'class', 'if', 'else', 'elif', 'for', 'while', 'import', 'return', 
+    'true', 'false', 'null', 'none', 'var', 'let', 'const', 'function', 'func', 
+    'public', 'private', 'protected', 'void', 'int', 'string', 'bool', 'float'
+]
+KEYWORD_RE = re.compile('|'.join(map(re.escape, FALLBACK_KEYWORDS)), re.IGNORECASE)
+DIGIT_RE = re.compile(r'\d')
+
+# Frame-render worker processes: the automation instance and per-video context arrive once
+# through the pool initializer, then each task only carries one frame's state
+_frame_worker_context = None
+
+def worker_mp_context():
+    """forkserver (or spawn) context for worker pools. Never fork: by the time a pool starts,
+    TTS, metadata (grpc) and upload threads may hold locks a forked child would inherit."""
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(start_method)
+
+def _init_day_worker(numba_threads):
+    if HAS_NUMBA:
+        # Several days render side by side; split the cores between them
+        numba.set_num_threads(max(1, min(numba_threads, numba.config.NUMBA_NUM_THREADS)))
+
+def _init_frame_worker(automation, frame_context):
+    global _frame_worker_context
+    if HAS_NUMBA:
+        # The pool already spreads frames over every core
+        numba.set_num_threads(1)
+    _frame_worker_context = (automation, frame_context)
+
+def _render_frame_chunk(states):
+    automation, frame_context = _frame_worker_context
+    return [automation.render_frame_state(frame_context, state) for state in states]
+
+def render_frames_bounded(pool, frame_states, chunksize=8, window=3):
+    """Yields frames in order while keeping at most `window` chunks in flight, so rendering
+    never runs more than a few chunks ahead of the encoder (unlike pool.map, which buffers all).
+
+    A 1080x1920 RGB frame is ~6.2 MB, so a chunk of 8 is ~50 MB and peak memory is about
+    (window + 1) chunks (the one being yielded stays alive): ~50 MB * (workers + 2) with
+    window = workers + 1, i.e. ~300 MB for 4 workers. One spare chunk keeps every worker busy."""
+    pending = deque()
+    for start in range(0, len(frame_states), chunksize):
+        pending.append(pool.submit(_render_frame_chunk, frame_states[start:start + chunksize]))
+        if len(pending) >= window:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
 class YouTubeAutomation:
     def __init__(self):
         # Sanitize keys by stripping whitespace
@@ -45,11 +330,23 @@ class YouTubeAutomation:
         self.elevenlabs_keys = [k for k in self.elevenlabs_keys if k]
         
         self.current_key_index = 0
+        # One keep-alive connection pool for all ElevenLabs calls (quota checks + TTS).
+        # Rate limits and 5xx are retried with backoff (honouring Retry-After) before a key is given up on
+        self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=1.0, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset({'GET', 'POST'}), raise_on_status=False)
+        self.session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry))
+        # key -> (remaining chars, checked_at); shared by the concurrent TTS jobs of a batch
+        self._quota_cache = {}
+        self._quota_lock = threading.Lock()
+        # key -> lock held while that key is being checked, so concurrent jobs share one request
+        self._quota_check_locks = {}
         
         # YouTube Credentials
         self.yt_client_id = os.getenv('YOUTUBE_CLIENT_ID', '').strip()
         self.yt_client_secret = os.getenv('YOUTUBE_CLIENT_SECRET', '').strip()
         self.yt_refresh_token = os.getenv('YOUTUBE_REFRESH_TOKEN', '').strip()
+        self.youtube_service = None
 
         # Google AI Key
         self.google_ai_key = os.getenv('GOOGLE_AI_API_KEY', '').strip() or os.getenv('GEMINI_API_KEY', '').strip()
@@ -77,8 +374,12 @@ class YouTubeAutomation:
                 
                 try:
                     found_models = []
+                    # Reuse yesterday's pick instead of paging through list_models() on every run
+                    active_model = self.load_cached_model()
+                    if active_model:
+                        print(f"   - Cached: {active_model}", flush=True)
                     # List models but stop if we find a high-priority one, or limit 
-                    for m in genai.list_models():
+                    for m in ([] if active_model else genai.list_models()):
                         if 'generateContent' in m.supported_generation_methods:
                             print(f"   - Found: {m.name}", flush=True)
                             found_models.append(m.name)
@@ -105,6 +406,8 @@ class YouTubeAutomation:
                     if active_model:
                         print(f"✅ Selected Model: {active_model}", flush=True)
                         self.genai_model = genai.GenerativeModel(active_model)
+                        if found_models:
+                            self.save_cached_model(active_model)
                     else:
                         print("⚠️ No specific 'gemini' model found, defaulting to 'gemini-pro'", flush=True)
                         self.genai_model = genai.GenerativeModel('gemini-pro')
@@ -124,10 +427,37 @@ class YouTubeAutomation:
         
         self.output_folder = Path("output")
         self.output_folder.mkdir(exist_ok=True)
+        # topic -> AI palette, loaded lazily from disk on the first themed video
+        self.theme_cache_path = self.output_folder / "theme_cache.json"
+        self._theme_cache = None
+        # AI scripts keyed by a hash of the day's content. Stored next to the audio it was voiced
+        # into, so a re-run regenerates the same script and hits the audio cache
+        self.audio_cache_dir = self.output_folder / "audio_cache"
+        self.script_cache_path = self.audio_cache_dir / "scripts.json"
+        self._script_cache = None
         
         self.width = 1080
         self.height = 1920
         self.fps = 30
+        self.load_fonts()
+        # Processes used to render the frames of one video
+        self.frame_workers = os.cpu_count() or 1
+        # Frame processes a pickled copy (a day worker) may start; its own copies (frame workers) get 1
+        self.worker_frame_workers = 1
+        # H.264 encoder for the ffmpeg pipe: 'auto' uses a working hardware encoder if there is one
+        self.video_codec = os.getenv('VIDEO_CODEC', 'auto').strip() or 'auto'
+        
+        # Finished title/CTA cards (text included) keyed by day, title and accent
+        self._static_layer_cache = {}
+        # Last few rendered code cards, keyed by everything that changes their pixels
+        self._code_card_cache = OrderedDict()
+        # Glass code card + DAY badge per pulse step, before any code is drawn
+        self._code_base_cache = OrderedDict()
+        self._blend_layer_cache = OrderedDict()
+        # Syntax-highlighted chunks per (text, language), reset for every video
+        self._chunk_cache = {}
+        # Wrapped output lines per (line, font, width), reset for every video
+        self._wrap_cache = {}
         
         self.language_names = {
             "python": "Python",
@@ -144,8 +474,8 @@ class YouTubeAutomation:
 
     def load_content(self, json_path="content.json"):
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(json_path, 'rb') as f:
+                data = parse_json(f.read())
             return data
         except json.JSONDecodeError as e:
             print(f"⚠️ JSON Decode Error in {json_path}: {e}")
@@ -170,9 +500,32 @@ class YouTubeAutomation:
             print(f"   ❌ Repair failed: {repair_error}")
             raise repair_error  # Re-raise the repair error
 
+    # Next to theme_cache.json, so the daily workflow's Actions cache carries it between runs
+    MODEL_CACHE_PATH = Path("output") / "model_cache.json"
+    MODEL_CACHE_TTL = 86400
+
+    def load_cached_model(self):
+        """Gemini model picked by a previous run, unless stale or REFRESH_MODELS is set."""
+        if os.getenv('REFRESH_MODELS', '').strip() not in ('', '0'):
+            return None
+        try:
+            with open(self.MODEL_CACHE_PATH, 'rb') as f:
+                cached = parse_json(f.read())
+            if time.time() - cached['ts'] < self.MODEL_CACHE_TTL:
+                return cached['model']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def save_cached_model(self, model_name):
+        try:
+            self.MODEL_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            self.save_content({'model': model_name, 'ts': time.time()}, str(self.MODEL_CACHE_PATH))
+        except Exception as e:
+            print(f"⚠️ Could not cache model choice: {e}")
+
     def save_content(self, data, json_path="content.json"):
         import tempfile
-        import shutil
         
         # Atomic Write: Write to temp file first, then move to destination
         # This prevents file corruption if the script crashes during write
@@ -180,12 +533,15 @@ class YouTubeAutomation:
         try:
             # Create temp file in the same directory to ensure atomic move works
             dir_name = os.path.dirname(json_path) or '.'
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, dir=dir_name, encoding='utf-8') as tmp:
-                json.dump(data, tmp, indent=2, ensure_ascii=False)
+            with tempfile.NamedTemporaryFile(mode='wb', delete=False, dir=dir_name) as tmp:
                 temp_file = tmp.name
+                tmp.write(dump_json_pretty(data))
+                # Make sure the bytes are on disk before the rename makes them the real file
+                tmp.flush()
+                os.fsync(tmp.fileno())
             
-            # Atomic move
-            shutil.move(temp_file, json_path)
+            # Atomic move: a single rename on the same filesystem, never a copy + delete fallback
+            os.replace(temp_file, json_path)
         except Exception as e:
             print(f"❌ Failed to save content: {e}")
             if temp_file and os.path.exists(temp_file):
@@ -198,6 +554,10 @@ class YouTubeAutomation:
                 return day
         return None
 
+    def get_pending_days(self, data, limit=None):
+        pending = [day for day in data['days'] if day.get('status') != 'uploaded']
+        return pending[:limit] if limit else pending
+
     def create_next_pending_day(self, data):
         """Create a draft day when the queue is exhausted so the automation can keep running.
         Uses AI to generate real lesson content instead of placeholder text."""
@@ -349,6 +709,17 @@ class YouTubeAutomation:
     def generate_dynamic_theme(self, topic):
         """Generates a unique color scheme for the video using AI or Random Logic."""
         if self.has_ai:
+            # Palettes persist between runs, so a retried or re-rendered day costs no AI call
+            if self._theme_cache is None:
+                try:
+                    self._theme_cache = self.load_content(str(self.theme_cache_path)) if self.theme_cache_path.exists() else {}
+                except Exception as e:
+                    # Only an optimisation (and possibly a truncated restore): never worth failing the run
+                    print(f"⚠️ Theme cache unreadable, starting afresh: {e}")
+                    self._theme_cache = {}
+                self._theme_cache = self._theme_cache if isinstance(self._theme_cache, dict) else {}
+            if topic in self._theme_cache:
+                return dict(self._theme_cache[topic])
             try:
                 prompt = f"""
                 Generate a dark, modern, high-contrast color palette for a video about "{topic}".
@@ -356,10 +727,17 @@ class YouTubeAutomation:
                 Use hex codes. Example: purity, cyber, matrix styles.
                 """
                 response = self.genai_model.generate_content(prompt)
-                text = response.text.replace('```json', '').replace('```', '').strip()
-                scheme = json.loads(text)
+                match = JSON_BLOCK_RE.search(response.text)
+                if not match:
+                    raise ValueError("no JSON object in response")
+                scheme = parse_json(match.group(0))
                 scheme['name'] = 'ai_generated'
-                return scheme
+                self._theme_cache[topic] = scheme
+                try:
+                    self.save_content(self._theme_cache, str(self.theme_cache_path))
+                except Exception:
+                    pass
+                return dict(scheme)
             except Exception as e:
                 print(f"⚠️ AI Theme Gen Failed: {e}. Using Random.")
         
@@ -384,6 +762,49 @@ class YouTubeAutomation:
 
 
 
+    @staticmethod
+    def day_content_key(day_data):
+        """Hash of the fields a day's script is written from (not status/upload_date)."""
+        content = {k: v for k, v in day_data.items() if k not in ('status', 'upload_date')}
+        return hashlib.sha256(json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+    def prune_audio_cache(self, max_age_days=14):
+        """Drops cached MP3s and scripts unused for `max_age_days`, so the cache CI saves stays small."""
+        if not self.audio_cache_dir.exists():
+            return
+        cutoff = time.time() - max_age_days * 86400
+        for path in self.audio_cache_dir.glob('*.mp3'):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+        scripts = self.load_script_cache()
+        kept = {k: v for k, v in scripts.items() if isinstance(v, dict) and v.get('ts', 0) >= cutoff}
+        if len(kept) != len(scripts):
+            self._script_cache = kept
+            self.save_script_cache()
+
+    def load_script_cache(self):
+        """Cached AI scripts by day_content_key. An unreadable file is only a lost cache, so it is reset."""
+        if self._script_cache is None:
+            try:
+                scripts = self.load_content(str(self.script_cache_path)) if self.script_cache_path.exists() else {}
+            except Exception as e:
+                print(f"⚠️ Script cache unreadable, starting afresh: {e}")
+                scripts = None
+            self._script_cache = scripts if isinstance(scripts, dict) else {}
+            if scripts is not self._script_cache:
+                self.save_script_cache()
+        return self._script_cache
+
+    def save_script_cache(self):
+        try:
+            self.audio_cache_dir.mkdir(parents=True, exist_ok=True)
+            self.save_content(self._script_cache, str(self.script_cache_path))
+        except Exception as e:
+            print(f"⚠️ Could not cache script: {e}")
+
     def generate_script(self, day_data):
         """Generates a viral spoken script based on the provided explanation."""
         title = day_data['title']
@@ -395,6 +816,13 @@ class YouTubeAutomation:
         cta = day_data.get('cta', '')
 
         if self.has_ai:
+            script_key = self.day_content_key(day_data)
+            cached = self.load_script_cache().get(script_key)
+            if cached:
+                cached['ts'] = time.time()  # keeps it from being pruned while it is still in use
+                self.save_script_cache()
+                print("♻️ Reusing cached AI script")
+                return cached['script']
             try:
                 # Determine broader topic from data or default to General
                 category = day_data.get('category', 'Education')
@@ -424,7 +852,10 @@ class YouTubeAutomation:
                    - Use "!" for excitement.
                 """
                 response = self.genai_model.generate_content(prompt)
-                return response.text.strip()
+                script = response.text.strip()
+                self._script_cache[script_key] = {'script': script, 'ts': time.time()}
+                self.save_script_cache()
+                return script
             except Exception as e:
                 print(f"⚠️ AI Script Gen Failed: {e}. Using Template.")
 
@@ -436,12 +867,43 @@ class YouTubeAutomation:
                  f"{cta} See you tomorrow!"
         return script.replace("Sub ", "Subscribe ")
 
+    def get_quota_remaining(self, api_key, index, ttl=300):
+        """Quota from the last check if it is under `ttl` seconds old, otherwise a fresh check.
+        Single-flight per key: jobs of a batch that arrive together wait for the first one's check."""
+        with self._quota_lock:
+            check_lock = self._quota_check_locks.setdefault(api_key, threading.Lock())
+        with check_lock:
+            with self._quota_lock:
+                cached = self._quota_cache.get(api_key)
+            if cached and time.time() - cached[1] < ttl:
+                print(f"   🔑 Key {index}: ~{cached[0]} chars remaining (cached)")
+                return cached[0]
+            remaining = self.check_elevenlabs_quota(api_key, index)
+            with self._quota_lock:
+                self._quota_cache[api_key] = (remaining, time.time())
+            return remaining
+
+    def reserve_quota(self, api_key, chars, margin=0):
+        """Deducts `chars` from the cached quota if the key has more than chars + margin left.
+        Check and deduction happen under one lock, so concurrent jobs can't over-commit a key."""
+        with self._quota_lock:
+            cached = self._quota_cache.get(api_key)
+            if not cached or cached[0] <= chars + margin:
+                return False
+            self._quota_cache[api_key] = (cached[0] - chars, cached[1])
+            return True
+
+    def forget_quota(self, api_key):
+        """Drops the cached quota of a key that just failed, so the next use checks it again."""
+        with self._quota_lock:
+            self._quota_cache.pop(api_key, None)
+
     def check_elevenlabs_quota(self, api_key, index):
         """Check user subscription and quota status"""
         url = "https://api.elevenlabs.io/v1/user/subscription"
         headers = {"xi-api-key": api_key}
         try:
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=headers, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 char_count = data.get('character_count', 0)
@@ -457,68 +919,101 @@ class YouTubeAutomation:
             print(f"   ❌ Key {index} Exception: {e}")
             return 0
 
-    def text_to_speech_elevenlabs(self, text, output_path):
+    def text_to_speech_elevenlabs(self, text, output_path, api_keys=None):
         """
         Generates speech using ElevenLabs API with smart key rotation.
         Falls back to Google TTS (gTTS - free) if all ElevenLabs keys are exhausted.
+        `api_keys` overrides the rotation order (used by concurrent batch synthesis).
         """
         # Josh Voice - Clear, confident male voice, great for tutorials
         VOICE_ID = "TxGEqnHWrfWFTfGW9XjX"  # Josh
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{VOICE_ID}"
+        MODEL_ID = "eleven_turbo_v2_5"  # Low-latency model, same voice
+        # Streaming endpoint: audio starts arriving while the rest is still being generated
+        url = f"https://api.elevenlabs.io/v1/text-to-speech/{VOICE_ID}/stream"
+        stream_params = {"optimize_streaming_latency": 3, "output_format": "mp3_44100_128"}
+        
+        # Balanced voice settings for clarity + emotion
+        voice_settings = {
+            "stability": 0.40,           # Balanced: 0.3-0.5 is stable but expressive
+            "similarity_boost": 0.75,
+            "style": 0.50,               # Moderate exaggeration
+            "use_speaker_boost": True
+        }
+        
+        keys = self.elevenlabs_keys if api_keys is None else api_keys
+        
+        # --- Audio Cache: identical script + voice never hits the paid API twice ---
+        cache_key = hashlib.sha256(
+            (text + json.dumps([VOICE_ID, MODEL_ID, voice_settings, stream_params], sort_keys=True)).encode('utf-8')
+        ).hexdigest()[:16]
+        cache_path = self.audio_cache_dir / f"{cache_key}.mp3"
+        if keys and cache_path.exists():
+            shutil.copyfile(cache_path, output_path)
+            os.utime(cache_path)  # still in use: keep it out of prune_audio_cache
+            print(f"♻️ Reusing cached ElevenLabs audio ({cache_key})")
+            return True
         
         # --- ElevenLabs Attempt ---
-        if self.elevenlabs_keys:
+        if keys:
             print("\n🔍 Checking ElevenLabs API Keys Quota...")
-            valid_key = None
+            # Check every key at once: one round-trip of latency instead of one per key
+            indices = [self.elevenlabs_keys.index(key) if key in self.elevenlabs_keys else 0 for key in keys]
+            with ThreadPoolExecutor(max_workers=len(keys)) as pool:
+                list(pool.map(self.get_quota_remaining, keys, indices))
             
-            for i, key in enumerate(self.elevenlabs_keys):
-                remaining = self.check_elevenlabs_quota(key, i)
-                # Need about 50 extra chars for safety margin
-                if remaining > len(text) + 50:
-                    print(f"   ✅ Key {i} selected (Has {remaining} chars, need ~{len(text)})")
-                    valid_key = key
-                    self.current_key_index = i
-                    break
-                else:
-                    print(f"   ⚠️ Key {i} skipped (Insufficient quota or invalid)")
+            data = {
+                "text": text,
+                "model_id": MODEL_ID,
+                "voice_settings": voice_settings
+            }
             
-            if valid_key:
-                print(f"🔄 Generating Audio with ElevenLabs Key {self.current_key_index}...")
+            for key, key_index in zip(keys, indices):
+                # Reserve the characters up front so concurrent jobs don't all pick the same key
+                # (about 50 extra chars are required as a safety margin)
+                if not self.reserve_quota(key, len(text), margin=50):
+                    print(f"   ⚠️ Key {key_index} skipped (Insufficient quota or invalid)")
+                    continue
+                print(f"   ✅ Key {key_index} selected (need ~{len(text)} chars)")
+                self.current_key_index = key_index
+                print(f"🔄 Generating Audio with ElevenLabs Key {key_index}...")
                 
                 headers = {
                     "Accept": "audio/mpeg",
+                    "Accept-Encoding": "identity",  # MP3 is already compressed
                     "Content-Type": "application/json",
-                    "xi-api-key": valid_key
-                }
-                
-                # Balanced voice settings for clarity + emotion
-                data = {
-                    "text": text,
-                    "model_id": "eleven_multilingual_v2",
-                    "voice_settings": {
-                        "stability": 0.40,           # Balanced: 0.3-0.5 is stable but expressive
-                        "similarity_boost": 0.75,
-                        "style": 0.50,               # Moderate exaggeration
-                        "use_speaker_boost": True
-                    }
+                    "xi-api-key": key
                 }
                 
                 try:
-                    response = requests.post(url, json=data, headers=headers)
-                    
-                    if response.status_code == 200:
-                        with open(output_path, 'wb') as f:
-                            f.write(response.content)
-                        print(f"✓ ElevenLabs Audio generated successfully")
-                        return True
-                    elif response.status_code == 401:
-                        print(f"⚠️ Auth failed (401). Response: {response.text}")
-                    else:
-                        print(f"❌ ElevenLabs API Error: {response.status_code} - {response.text}")
+                    # Stream the MP3 straight to disk instead of holding the whole body in memory
+                    with self.session.post(url, params=stream_params, json=data, headers=headers,
+                                           stream=True, timeout=(10, 300)) as response:
+                        if response.status_code == 200:
+                            response.raw.decode_content = True
+                            # Stream into a temp file and rename it into the cache, so an interrupted
+                            # download can never leave a truncated MP3 that later runs would reuse
+                            cache_path.parent.mkdir(exist_ok=True)
+                            part_path = cache_path.with_name(f"{cache_key}.{os.getpid()}.{threading.get_ident()}.part")
+                            try:
+                                with open(part_path, 'wb') as f:
+                                    shutil.copyfileobj(response.raw, f, 65536)
+                                os.replace(part_path, cache_path)
+                            finally:
+                                if part_path.exists():
+                                    part_path.unlink()
+                            shutil.copyfile(cache_path, output_path)
+                            print(f"✓ ElevenLabs Audio generated successfully")
+                            return True
+                        elif response.status_code == 401:
+                            print(f"⚠️ Auth failed (401). Response: {response.text}")
+                        else:
+                            print(f"❌ ElevenLabs API Error: {response.status_code} - {response.text}")
                 except Exception as e:
                     print(f"❌ ElevenLabs Exception: {e}")
-            else:
-                print("⚠️ All ElevenLabs keys exhausted. Trying free fallback...")
+                # The cached quota for this key can't be trusted any more: re-check it next time
+                self.forget_quota(key)
+                print("🔄 Trying next ElevenLabs key...")
+            print("⚠️ All ElevenLabs keys exhausted. Trying free fallback...")
         else:
             print("⚠️ No ElevenLabs API keys configured. Using free fallback...")
         
@@ -537,7 +1032,45 @@ class YouTubeAutomation:
         
         return False
 
-    def hex_to_rgb(self, hex_color):
+    def synthesize_audio_batch(self, jobs):
+        """
+        Starts TTS for every (script, audio_path) job concurrently and returns one future per job.
+        Each worker starts its key rotation at a different ElevenLabs key so parallel
+        requests don't compete for the same quota.
+        """
+        workers = max(1, len(self.elevenlabs_keys))
+        pool = ThreadPoolExecutor(max_workers=workers)
+        futures = []
+        for i, (script, audio_path) in enumerate(jobs):
+            shard = i % workers
+            keys = self.elevenlabs_keys[shard:] + self.elevenlabs_keys[:shard]
+            futures.append(pool.submit(self.text_to_speech_elevenlabs, script, str(audio_path), keys))
+        pool.shutdown(wait=False)
+        return futures
+
+    def write_silent_audio(self, audio_path, duration=10):
+        """Copies a silent MP3 of `duration` seconds to audio_path, encoding it only the first time."""
+        silent_path = self.output_folder / f"silent_{duration}s.mp3"
+        if not silent_path.exists():
+            from moviepy.audio.AudioClip import AudioArrayClip
+            silence = np.zeros((int(duration * 44100), 2))
+            silent_clip = AudioArrayClip(silence, fps=44100)
+            # Encode to a temp file and rename it into place, so concurrent day workers
+            # never copy a half-written MP3 (moviepy picks the codec from the .mp3 suffix)
+            part_path = silent_path.with_name(f"{silent_path.stem}.{os.getpid()}.{threading.get_ident()}.part.mp3")
+            try:
+                silent_clip.write_audiofile(str(part_path), fps=44100)
+                os.replace(part_path, silent_path)
+            finally:
+                if part_path.exists():
+                    part_path.unlink()
+        shutil.copyfile(silent_path, audio_path)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def hex_to_rgb(hex_color):
+        # Pure and called from the per-frame paths with a handful of distinct colors
+        # (the per-frame hue-shifted gradient colors no longer go through here)
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
@@ -545,49 +1078,28 @@ class YouTubeAutomation:
         """
         Returns a list of (text_segment, hex_color) tuples for syntax highlighting.
         Uses Pygments if available, otherwise falls back to simple logic.
+        Results are memoized: the same line prefixes recur across many frames of a video.
         """
         if not text:
             return []
-            
+        
+        key = (text, language)
+        chunks = self._chunk_cache.get(key)
+        if chunks is None:
+            chunks = self._highlight_text(text, language)
+            self._chunk_cache[key] = chunks
+        return chunks
+
+    def _highlight_text(self, text, language):
         chunks = []
         
         if HAS_PYGMENTS:
             try:
-                # Map Pygments Token types to Hex Colors
-                # Dracular/Monokai-ish style
-                STYLE_MAP = {
-                    Token.Keyword: '#ff79c6',       # Pink
-                    Token.Keyword.Declaration: '#8be9fd', # Cyan (def, class)
-                    Token.Keyword.Namespace: '#ff79c6',   # Pink (import)
-                    Token.Name.Function: '#50fa7b', # Green
-                    Token.Name.Class: '#50fa7b',    # Green
-                    Token.Name.Builtin: '#8be9fd',  # Cyan
-                    Token.String: '#f1fa8c',        # Yellow
-                    Token.Number: '#bd93f9',        # Purple
-                    Token.Operator: '#ff79c6',      # Pink
-                    Token.Comment: '#6272a4',       # Grey/Blue
-                    Token.Text: '#f8f8f2',          # White
-                    Token.Literal: '#bd93f9',
-                    Token.Punctuation: '#f8f8f2'
-                }
-                
-                try:
-                    lexer = get_lexer_by_name(language)
-                except:
-                    lexer = get_lexer_by_name("text")
-                    
+                lexer = get_code_lexer(language)
                 tokens = lex(text, lexer)
                 
                 for token_type, value in tokens:
-                    # Find best color match (walk up the token hierarchy)
-                    color = '#f8f8f2' # Default white
-                    parent = token_type
-                    while parent:
-                        if parent in STYLE_MAP:
-                            color = STYLE_MAP[parent]
-                            break
-                        parent = parent.parent
-                    
+                    color = token_color(token_type)
                     chunks.append((value, color))
                 return chunks
                 
@@ -597,101 +1109,90 @@ class YouTubeAutomation:
         
         # --- FALLBACK (Old logic) ---
         # Generic Syntax Highlighting for ANY language
-        keywords = [
-            'print', 'def', 'class', 'if', 'else', 'elif', 'for', 'while', 'import', 'return', 
-            'true', 'false', 'null', 'none', 'var', 'let', 'const', 'function', 'func', 
-            'public', 'private', 'protected', 'void', 'int', 'string', 'bool', 'float'
-        ]
-        
-        line_lower = text.lower()
+        stripped = text.strip()
         color = '#ffffff'
         
-        if text.strip().startswith('#') or text.strip().startswith('//'):
+        if stripped.startswith(('#', '//')):
             color = '#808080'
-        elif any(f"{kw}" in line_lower for kw in keywords):
+        elif KEYWORD_RE.search(text):
             color = '#ff3e9d'
         elif '"' in text or "'" in text:
             color = '#00ff88'
-        elif any(c.isdigit() for c in text):
+        elif DIGIT_RE.search(text):
             color = '#ffff00'
             
         return [(text, color)]
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def hex_to_hsv(hex_color):
+        # Only t varies between frames, so the base color's HSV is converted once
+        r, g, b = YouTubeAutomation.hex_to_rgb(hex_color)
+        return colorsys.rgb_to_hsv(r/255, g/255, b/255)
+
     def get_color_shift(self, hex_color, t, speed=0.5):
         """Shifts the hue of a color over time."""
-        import colorsys
-        r, g, b = self.hex_to_rgb(hex_color)
-        h, s, v = colorsys.rgb_to_hsv(r/255, g/255, b/255)
+        return '#{:02x}{:02x}{:02x}'.format(*self.get_color_shift_rgb(hex_color, t, speed))
+
+    def get_color_shift_rgb(self, hex_color, t, speed=0.5):
+        """get_color_shift as an RGB tuple, without the round trip through a hex string."""
+        h, s, v = self.hex_to_hsv(hex_color)
         new_h = (h + t * speed) % 1.0
         r, g, b = colorsys.hsv_to_rgb(new_h, s, v)
-        return '#{:02x}{:02x}{:02x}'.format(int(r*255), int(g*255), int(b*255))
+        return int(r*255), int(g*255), int(b*255)
 
     def create_animated_bg(self, width, height, color1, color2, t):
         """Creates a gradient using numpy for speed."""
-        c1 = self.get_color_shift(color1, t, 0.1)
-        c2 = self.get_color_shift(color2, t, 0.15)
-        
-        # Use simple gradient calculation with numpy if possible, or fallback to efficient line drawing
-        # For 30FPS rendering, we need speed. 
-        # Let's use a simpler approach: Pre-calculate the gradient line and tile it?
-        # No, let's just use the existing logic but with shifted colors and optimized drawing.
-        
-        img = Image.new('RGB', (width, height))
-        draw = ImageDraw.Draw(img)
+        return Image.fromarray(self.create_gradient_array(width, height, color1, color2, t))
+
+    def create_gradient_array(self, width, height, color1, color2, t):
+        """Same gradient as create_animated_bg, as a writable (height, width, 3) uint8 array."""
+        c1 = self.get_color_shift_rgb(color1, t, 0.1)
+        c2 = self.get_color_shift_rgb(color2, t, 0.15)
         
         # Color shifting already makes it dynamic. 
-        # To make it faster, we can draw fewer lines (interpolated) or use a smaller image and resize.
-        # Resizing from a smaller gradient is much faster and looks smooth for gradients.
-        
-        small_h = 100 # Generate gradient at low res
-        r1, g1, b1 = self.hex_to_rgb(c1)
-        r2, g2, b2 = self.hex_to_rgb(c2)
-        
-        # Create array of colors
-        channels = []
-        for c_start, c_end in [(r1, r2), (g1, g2), (b1, b2)]:
-            arr = np.linspace(c_start, c_end, small_h)
-            channels.append(arr)
-            
-        # Stack and resize
-        gradient = np.dstack(channels).astype(np.uint8) # Shape (small_h, 1, 3)
-        # Repeat to fill width (only need 1 pixel width actually)
-        gradient = np.tile(gradient, (1, 1, 1)) # Keep it 1px wide for resize
-        
-        grad_img = Image.fromarray(gradient)
-        grad_img = grad_img.resize((width, height), resample=Image.Resampling.LANCZOS)
+        # Build the horizontal ramp once at full width, then fill every row with it in one C-level copy
+        ramp = np.linspace(c1, c2, width).astype(np.uint8) # Shape (width, 3)
+        gradient = np.empty((height, width, 3), dtype=np.uint8)
+        gradient[:] = ramp
         
-        return grad_img
+        return gradient
 
     def create_glassmorphism_card(self, width, height, scheme):
-        card = Image.new('RGBA', (width, height), (255, 255, 255, 0))
-        glass = Image.new('RGBA', (width, height), (255, 255, 255, 25))
-        card = Image.alpha_composite(card, glass)
-        draw = ImageDraw.Draw(card)
-        accent_rgb = self.hex_to_rgb(scheme['accent'])
-        for i in range(8, 0, -2):
-            alpha = int(100 - i * 10)
-            draw.rounded_rectangle([i, i, width-i, height-i], radius=25, 
-                                   outline=accent_rgb + (alpha,), width=3)
-        card = card.filter(ImageFilter.GaussianBlur(3))
-        return card
+        """Returns a fresh copy of the blurred glass card, rendered once per size and accent color."""
+        return render_glass_card(width, height, self.hex_to_rgb(scheme['accent'])).copy()
 
     def draw_text_with_glow(self, draw, pos, text, font, color, glow_color=None):
         if glow_color is None:
             glow_color = color
         glow_rgb = self.hex_to_rgb(glow_color) if isinstance(glow_color, str) else glow_color
-        for offset in [(2,2), (-2,2), (2,-2), (-2,-2), (3,3), (-3,-3)]:
-            draw.text((pos[0]+offset[0], pos[1]+offset[1]), text, 
-                     fill=glow_rgb + (60,), font=font)
-        draw.text(pos, text, fill=color, font=font)
+        # One stamp of the merged glow mask, then the cached glyph mask for the text itself
+        # (draw.bitmap blends exactly like draw.text, minus the FreeType work)
+        glow_mask, glow_pad = render_glow_mask(text, font)
+        draw.bitmap((pos[0]-glow_pad, pos[1]-glow_pad), glow_mask, fill=glow_rgb + (60,))
+        mask, pad = render_text_mask(text, font)
+        draw.bitmap((pos[0]-pad, pos[1]-pad), mask, fill=color)
 
     def measure_text_width(self, draw, text, font):
         try:
-            bbox = draw.textbbox((0, 0), text, font=font)
-            return bbox[2] - bbox[0]
+            return measure_text_bbox_width(text, font, draw.fontmode)
         except Exception:
             return 0
 
+    def fit_text_length(self, draw, text, font, max_width):
+        """Longest prefix length of `text` that fits in max_width (0 if not even one char does).
+        Starts from the text's average char width and steps from there, instead of
+        shrinking one character at a time from the full length."""
+        full_w = self.measure_text_width(draw, text, font)
+        if full_w <= max_width:
+            return len(text)
+        cut = min(len(text) - 1, max(1, int(max_width * len(text) / full_w)))
+        while cut < len(text) - 1 and self.measure_text_width(draw, text[:cut + 1], font) <= max_width:
+            cut += 1
+        while cut > 0 and self.measure_text_width(draw, text[:cut], font) > max_width:
+            cut -= 1
+        return cut
+
     def wrap_code_line(self, text, draw, font, max_width):
         """Wrap a single code line by pixel width while preserving indentation."""
         if text is None:
@@ -718,9 +1219,7 @@ class YouTubeAutomation:
                 available_w = max_width
                 prefix = ""
 
-            cut = len(remaining)
-            while cut > 0 and self.measure_text_width(draw, remaining[:cut], font) > available_w:
-                cut -= 1
+            cut = self.fit_text_length(draw, remaining, font, available_w)
 
             if cut <= 0:
                 cut = 1
@@ -754,9 +1253,7 @@ class YouTubeAutomation:
         remaining = text
 
         while remaining:
-            cut = len(remaining)
-            while cut > 0 and self.measure_text_width(draw, remaining[:cut], font) > max_width:
-                cut -= 1
+            cut = self.fit_text_length(draw, remaining, font, max_width)
 
             if cut <= 0:
                 cut = 1
@@ -774,88 +1271,135 @@ class YouTubeAutomation:
 
         return wrapped if wrapped else [""]
 
-    def create_video_frame(self, scheme, day, title, language, code_lines, output_text, 
-                          code_progress, output_progress, show_output, t_val=0, total_duration=10):
-        
-        frame = self.create_animated_bg(self.width, self.height, scheme['bg1'], scheme['bg2'], t_val)
-        draw = ImageDraw.Draw(frame)
-        
-        # Moving Grid
-        grid_color = self.hex_to_rgb(scheme['accent'])
-        grid_offset_y = int(t_val * 20) % 100
-        grid_offset_x = int(t_val * 10) % 100
-        
-        for x in range(0 - grid_offset_x, self.width, 100):
-            for y in range(0 - grid_offset_y, self.height, 100):
-                 # Use transparency for subtle grid
-                draw.rectangle([x, y, x+1, y+1], fill=grid_color + (30,))
-        
-        
-        
-        try:
-            if os.path.exists("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"):
-                title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 65)
-                code_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf", 40)
-                day_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 55)
-                output_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSansMono-Bold.ttf", 36)
-                cta_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 50)
-            else:
-                title_font = ImageFont.load_default()
-                code_font = ImageFont.load_default()
-                day_font = ImageFont.load_default()
-                output_font = ImageFont.load_default()
-                cta_font = ImageFont.load_default()
-        except:
-            title_font = ImageFont.load_default()
-            code_font = ImageFont.load_default()
-            day_font = ImageFont.load_default()
-            output_font = ImageFont.load_default()
-            cta_font = ImageFont.load_default()
-
-        # --- TITLE LOGIC (Dynamic Height & Emoji Stripping) ---
-        import re
-        # Strip emojis for video display (keep ASCII + basic punctuation)
-        clean_title = title.encode('ascii', 'ignore').decode('ascii').strip()
-        full_title = f"Day {day}: {clean_title}"
-        
-        # Word Wrap
+    def wrap_output_lines(self, text, draw, font, max_width):
+        """wrap_text_by_width over every line of `text`. Each raw line is wrapped once per video:
+        the full output (for the box height) and the typed output share their finished lines."""
+        out_lines = []
+        for raw_line in text.split('\n'):
+            key = (raw_line, font, max_width, draw.fontmode)
+            wrapped = self._wrap_cache.get(key)
+            if wrapped is None:
+                wrapped = self._wrap_cache[key] = self.wrap_text_by_width(raw_line, draw, font, max_width)
+            out_lines.extend(wrapped)
+        return out_lines
+
+    def layout_title(self, full_title, title_font, max_width, card_width, padding, line_height):
+        """Word-wraps the title and returns centered (x, y, line) positions. Each line's width is
+        the one measured while wrapping, so nothing is measured twice."""
         title_draw_temp = ImageDraw.Draw(Image.new('RGBA', (1,1))) # Temp for measuring
-        words = full_title.split()
         lines = []
         current_line = []
+        current_w = 0
         
-        max_width = self.width - 180
-        
-        for word in words:
+        for word in full_title.split():
             test_line = ' '.join(current_line + [word])
             bbox = title_draw_temp.textbbox((0, 0), test_line, font=title_font)
             if (bbox[2] - bbox[0]) < max_width:
                 current_line.append(word)
+                current_w = bbox[2] - bbox[0]
             else:
                 if current_line:
-                    lines.append(' '.join(current_line))
+                    lines.append((' '.join(current_line), current_w))
                 current_line = [word]
+                bbox = title_draw_temp.textbbox((0, 0), word, font=title_font)
+                current_w = bbox[2] - bbox[0]
         if current_line:
-            lines.append(' '.join(current_line))
-            
+            lines.append((' '.join(current_line), current_w))
+        
+        return [((card_width - w) // 2, padding + i * line_height, line) for i, (line, w) in enumerate(lines)]
+
+    def create_title_card(self, scheme, day, title, title_font):
+        key = ('title', day, title, scheme['accent'])
+        if key in self._static_layer_cache:
+            return self._static_layer_cache[key]
+        
+        # --- TITLE LOGIC (Dynamic Height & Emoji Stripping) ---
+        # Strip emojis for video display (keep ASCII + basic punctuation)
+        clean_title = title.encode('ascii', 'ignore').decode('ascii').strip()
+        full_title = f"Day {day}: {clean_title}"
+        
         # Calculate Dynamic Height
         line_height = 70
         padding = 50
-        card_h = (len(lines) * line_height) + (padding * 2)
+        layout = self.layout_title(full_title, title_font, self.width - 180, self.width - 80, padding, line_height)
+        card_h = (len(layout) * line_height) + (padding * 2)
         
         # Create Card
         title_card = self.create_glassmorphism_card(self.width - 80, card_h, scheme)
         title_draw = ImageDraw.Draw(title_card)
         
-        y = padding
-        for line in lines:
-            bbox = title_draw.textbbox((0, 0), line, font=title_font)
-            x = ((self.width - 80) - (bbox[2] - bbox[0])) // 2
+        for x, y, line in layout:
             self.draw_text_with_glow(title_draw, (x, y), line, title_font, '#ffffff', scheme['accent'])
-            y += line_height
-            
-        frame.paste(title_card, (40, 50), title_card)
         
+        self._static_layer_cache[key] = title_card
+        return title_card
+
+    def create_cta_card(self, scheme, day, cta_font, output_font):
+        key = ('cta', day, scheme['accent'])
+        if key in self._static_layer_cache:
+            return self._static_layer_cache[key]
+        
+        cta_card = self.create_glassmorphism_card(self.width - 60, 200, scheme)
+        cta_draw = ImageDraw.Draw(cta_card)
+        cta_text = "LIKE & FOLLOW"
+        bbox = cta_draw.textbbox((0, 0), cta_text, font=cta_font)
+        cta_x = ((self.width - 60) - (bbox[2] - bbox[0])) // 2
+        self.draw_text_with_glow(cta_draw, (cta_x, 45), cta_text, cta_font, '#ffffff', scheme['accent'])
+        sub_text = f"Day {day + 1} Coming Soon!"
+        bbox2 = cta_draw.textbbox((0, 0), sub_text, font=output_font)
+        sub_x = ((self.width - 60) - (bbox2[2] - bbox2[0])) // 2
+        cta_draw.text((sub_x, 125), sub_text, fill=self.hex_to_rgb(scheme['accent']), font=output_font)
+        
+        self._static_layer_cache[key] = cta_card
+        return cta_card
+
+    def create_code_card_base(self, scheme, day, width, height, pulse_value, day_font):
+        """Returns a fresh copy of the glass code card with its DAY badge drawn for this pulse."""
+        key = ('code_base', day, width, height, pulse_value, scheme['accent'], scheme['badge'], day_font)
+        base = self._code_base_cache.get(key)
+        if base is None:
+            code_card = self.create_glassmorphism_card(width, height, scheme)
+            code_draw = ImageDraw.Draw(code_card)
+            
+            # Dynamic badge width based on day number text
+            day_text = f"DAY {day}"
+            day_text_w = measure_text_bbox_width(day_text, day_font, code_draw.fontmode)
+            badge_padding = 60  # horizontal padding inside badge
+            badge_w = max(220, day_text_w + badge_padding)
+            badge_h = 95
+            badge_x, badge_y = 35, 30
+            badge_rgb = self.hex_to_rgb(scheme['badge'])
+            
+            pulse = abs(np.sin(pulse_value * 0.2) * 0.3) + 0.7
+            for offset in range(15, 0, -2):
+                alpha = int(150 * pulse - offset * 10)
+                code_draw.rounded_rectangle(
+                    [badge_x-offset, badge_y-offset, badge_x+badge_w+offset, badge_y+badge_h+offset],
+                    radius=25, fill=badge_rgb + (max(0, alpha),)
+                )
+            
+            code_draw.rounded_rectangle([badge_x, badge_y, badge_x+badge_w, badge_y+badge_h], 
+                                        radius=25, fill=badge_rgb)
+            
+            border_offset = int(3 * pulse)
+            code_draw.rounded_rectangle(
+                [badge_x+border_offset, badge_y+border_offset, 
+                 badge_x+badge_w-border_offset, badge_y+badge_h-border_offset],
+                radius=25, outline=(255, 255, 255, 200), width=3
+            )
+            
+            text_x = badge_x + (badge_w - day_text_w) // 2
+            for offset in [(2,2), (-2,2), (2,-2), (-2,-2)]:
+                 code_draw.text((text_x+offset[0], badge_y+18+offset[1]), day_text, fill=(255, 255, 255, 100), font=day_font)
+            code_draw.text((text_x, badge_y + 18), day_text, fill='#ffffff', font=day_font)
+            base = self._code_base_cache[key] = code_card
+            # The pulse only moves forward while typing, so a few entries are plenty
+            if len(self._code_base_cache) > 4:
+                self._code_base_cache.popitem(last=False)
+        return base.copy()
+
+    def create_code_card(self, scheme, day, language, code_lines, output_text, code_progress,
+                         output_progress, show_output, t_val, code_font, day_font, output_font):
         # --- CODE RENDERING LOGIC (WRAPPED VISUAL LINES) ---
         MAX_VISUAL_LINES = 16
         LINE_HEIGHT = 56
@@ -863,44 +1407,10 @@ class YouTubeAutomation:
         # Fixed height for code card to ensure fit, large enough for code + output
         card_height = 1200 
         
-        code_card = self.create_glassmorphism_card(int(self.width * 0.92), card_height, scheme)
-        code_draw = ImageDraw.Draw(code_card)
-        
-        # Dynamic badge width based on day number text
-        day_text = f"DAY {day}"
-        day_text_bbox = code_draw.textbbox((0, 0), day_text, font=day_font)
-        day_text_w = day_text_bbox[2] - day_text_bbox[0]
-        badge_padding = 60  # horizontal padding inside badge
-        badge_w = max(220, day_text_w + badge_padding)
-        badge_h = 95
-        badge_x, badge_y = 35, 30
-        badge_rgb = self.hex_to_rgb(scheme['badge'])
-        
+        # Glass + DAY badge only change with the pulse (lines started), so they come from a cached base
         pulse_value = len(code_progress) if code_progress else 0
-        pulse = abs(np.sin(pulse_value * 0.2) * 0.3) + 0.7
-        for offset in range(15, 0, -2):
-            alpha = int(150 * pulse - offset * 10)
-            code_draw.rounded_rectangle(
-                [badge_x-offset, badge_y-offset, badge_x+badge_w+offset, badge_y+badge_h+offset],
-                radius=25, fill=badge_rgb + (max(0, alpha),)
-            )
-        
-        code_draw.rounded_rectangle([badge_x, badge_y, badge_x+badge_w, badge_y+badge_h], 
-                                    radius=25, fill=badge_rgb)
-        
-        border_offset = int(3 * pulse)
-        code_draw.rounded_rectangle(
-            [badge_x+border_offset, badge_y+border_offset, 
-             badge_x+badge_w-border_offset, badge_y+badge_h-border_offset],
-            radius=25, outline=(255, 255, 255, 200), width=3
-        )
-        
-        bbox = code_draw.textbbox((0, 0), day_text, font=day_font)
-        text_w = bbox[2] - bbox[0]
-        text_x = badge_x + (badge_w - text_w) // 2
-        for offset in [(2,2), (-2,2), (2,-2), (-2,-2)]:
-             code_draw.text((text_x+offset[0], badge_y+18+offset[1]), day_text, fill=(255, 255, 255, 100), font=day_font)
-        code_draw.text((text_x, badge_y + 18), day_text, fill='#ffffff', font=day_font)
+        code_card = self.create_code_card_base(scheme, day, int(self.width * 0.92), card_height, pulse_value, day_font)
+        code_draw = ImageDraw.Draw(code_card)
         
         y_offset = 150
         # Dynamic line number gutter: measure widest possible line number
@@ -913,22 +1423,26 @@ class YouTubeAutomation:
         visual_entries = []
         typed_count = len(code_progress)
 
-        for original_idx in range(typed_count):
+        # Only the last MAX_VISUAL_LINES visual lines are shown, so wrap from the newest line
+        # backwards and stop once the window is full (lines scrolled off are never wrapped)
+        for original_idx in range(typed_count - 1, -1, -1):
+            if len(visual_entries) >= MAX_VISUAL_LINES:
+                break
             displayed_line = code_progress[original_idx]
             wrapped_segments = self.wrap_code_line(displayed_line, code_draw, code_font, code_text_max_w)
 
             if not wrapped_segments:
                 wrapped_segments = [""]
 
-            for seg_idx, segment in enumerate(wrapped_segments):
+            for seg_idx in range(len(wrapped_segments) - 1, -1, -1):
                 visual_entries.append({
                     "original_idx": original_idx,
                     "line_num": f"{original_idx + 1}." if seg_idx == 0 else "",
-                    "text": segment,
+                    "text": wrapped_segments[seg_idx],
                     "is_active": (original_idx == typed_count - 1 and seg_idx == len(wrapped_segments) - 1)
                 })
 
-        visible_entries = visual_entries[-MAX_VISUAL_LINES:]
+        visible_entries = visual_entries[:MAX_VISUAL_LINES][::-1]
         active_entry_for_cursor = None
 
         for entry in visible_entries:
@@ -971,9 +1485,7 @@ class YouTubeAutomation:
             output_text_max_w = (code_card.width - 30) - 50 - 20
             
             # Pre-calculate ALL lines to determine full height needed
-            full_out_lines = []
-            for raw_line in output_text.split('\n'):
-                full_out_lines.extend(self.wrap_text_by_width(raw_line, code_draw, output_font, output_text_max_w))
+            full_out_lines = self.wrap_output_lines(output_text, code_draw, output_font, output_text_max_w)
             
             # Dynamic Height Calculation
             # Base height 145 (approx 3 lines) -> each extra line adds ~40px
@@ -992,23 +1504,12 @@ class YouTubeAutomation:
             
             output_y_start = card_height - output_box_height - 30 # 30px margin from bottom
             
-            # Draw output container
-            for offset in range(8, 0, -2):
-                alpha = 80 - offset * 10
-                code_draw.rounded_rectangle(
-                    [30-offset, output_y_start-offset, code_card.width-30+offset, output_y_start+output_box_height+offset],
-                    radius=18, fill=self.hex_to_rgb('#00ff88') + (alpha,)
-                )
-            code_draw.rounded_rectangle(
-                [30, output_y_start, code_card.width-30, output_y_start+output_box_height],
-                radius=18, fill=(0, 50, 25, 220)
-            )
-            code_draw.text((50, output_y_start + 15), "▶ OUTPUT:", fill='#00ff88', font=output_font)
+            # Draw output container (pre-rendered glow rings, panel and header)
+            box, box_mask = render_output_box(code_card.width - 60, output_box_height, output_font)
+            code_card.paste(box, (30 - OUTPUT_GLOW_REACH, output_y_start - OUTPUT_GLOW_REACH), box_mask)
             
             # Re-process displayed lines for actual rendering
-            out_lines = []
-            for raw_line in displayed_output.split('\n'):
-                out_lines.extend(self.wrap_text_by_width(raw_line, code_draw, output_font, output_text_max_w))
+            out_lines = self.wrap_output_lines(displayed_output, code_draw, output_font, output_text_max_w)
             
             # Show last N visible lines based on dynamic height
             visible_out = out_lines[-display_lines_count:]
@@ -1026,7 +1527,7 @@ class YouTubeAutomation:
                     last_line_width = 0
                     if visible_out:
                         try:
-                            last_line_width = code_draw.textbbox((0, 0), visible_out[-1], font=output_font)[2]
+                            last_line_width = measure_text_bbox(visible_out[-1], output_font, code_draw.fontmode)[2]
                         except: pass
                     
                     cursor_x_out = 50 + last_line_width + 2
@@ -1034,41 +1535,139 @@ class YouTubeAutomation:
                     
                     code_draw.rectangle([cursor_x_out, cursor_y_out, cursor_x_out+10, cursor_y_out+35], fill='#ffffff')
 
+        return code_card
+
+    def load_fonts(self):
+        """Opens the frame fonts once; create_video_frame reuses these handles."""
+        try:
+            if os.path.exists("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"):
+                self.title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 65)
+                self.code_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf", 40)
+                self.day_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 55)
+                self.output_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSansMono-Bold.ttf", 36)
+                self.cta_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 50)
+            else:
+                self.title_font = ImageFont.load_default()
+                self.code_font = ImageFont.load_default()
+                self.day_font = ImageFont.load_default()
+                self.output_font = ImageFont.load_default()
+                self.cta_font = ImageFont.load_default()
+        except:
+            self.title_font = ImageFont.load_default()
+            self.code_font = ImageFont.load_default()
+            self.day_font = ImageFont.load_default()
+            self.output_font = ImageFont.load_default()
+            self.cta_font = ImageFont.load_default()
+
+    def create_video_frame(self, scheme, day, title, language, code_lines, output_text, 
+                          code_progress, output_progress, show_output, t_val=0, total_duration=10):
+        
+        bg = self.create_gradient_array(self.width, self.height, scheme['bg1'], scheme['bg2'], t_val)
+        
+        # Moving Grid: 2x2 dots every 100px, stamped straight into the background array
+        grid_color = self.hex_to_rgb(scheme['accent'])
+        grid_offset_y = int(t_val * 20) % 100
+        grid_offset_x = int(t_val * 10) % 100
+        for dy in (0, 1):
+            for dx in (0, 1):
+                bg[(dy - grid_offset_y) % 100::100, (dx - grid_offset_x) % 100::100] = grid_color
+        
+        title_font, code_font, day_font = self.title_font, self.code_font, self.day_font
+        output_font, cta_font = self.output_font, self.cta_font
+
+        # Title and CTA cards only depend on scheme/day/title, so they are rendered once per video
+        title_card = self.create_title_card(scheme, day, title, title_font)
+        self.blend_card(bg, title_card, 40, 50)
+        
+        # The code card only changes with typing/output progress and cursor blinks,
+        # so consecutive frames in the same state reuse the rendered card
+        card_key = (scheme['accent'], scheme['badge'], day, language, len(code_lines), output_text,
+                    tuple(code_progress), output_progress, show_output,
+                    int(t_val * 2) % 2 == 0, int(t_val * 4) % 2 == 0)
+        code_card = self._code_card_cache.get(card_key)
+        if code_card is None:
+            code_card = self.create_code_card(scheme, day, language, code_lines, output_text, code_progress,
+                                              output_progress, show_output, t_val, code_font, day_font, output_font)
+            self._code_card_cache[card_key] = code_card
+            if len(self._code_card_cache) > 8:
+                self._code_card_cache.popitem(last=False)
+        
         code_x = (self.width - code_card.width) // 2
-        frame.paste(code_card, (code_x, 320), code_card)
+        self.blend_card(bg, code_card, code_x, 320, cache=False)
         
-        cta_card = self.create_glassmorphism_card(self.width - 60, 200, scheme)
-        cta_draw = ImageDraw.Draw(cta_card)
-        cta_text = "LIKE & FOLLOW"
-        bbox = cta_draw.textbbox((0, 0), cta_text, font=cta_font)
-        cta_x = ((self.width - 60) - (bbox[2] - bbox[0])) // 2
-        self.draw_text_with_glow(cta_draw, (cta_x, 45), cta_text, cta_font, '#ffffff', scheme['accent'])
-        sub_text = f"Day {day + 1} Coming Soon!"
-        bbox2 = cta_draw.textbbox((0, 0), sub_text, font=output_font)
-        sub_x = ((self.width - 60) - (bbox2[2] - bbox2[0])) // 2
-        cta_draw.text((sub_x, 125), sub_text, fill=self.hex_to_rgb(scheme['accent']), font=output_font)
+        cta_card = self.create_cta_card(scheme, day, cta_font, output_font)
         
         # Progress Bar at the top
         progress_pct = min(1.0, t_val / total_duration)
         bar_height = 15
-        draw.rectangle([0, 0, int(self.width * progress_pct), bar_height], fill=self.hex_to_rgb(scheme['accent']))
+        bg[:bar_height + 1, :int(self.width * progress_pct) + 1] = self.hex_to_rgb(scheme['accent'])
+        
+        self.blend_card(bg, cta_card, 30, self.height - 270)
+        return bg
+
+    def blend_card(self, frame, card, x, y, cache=True):
+        """Alpha-blends an RGBA card onto the RGB frame array in place, matching Image.paste rounding.
+        `cache` keeps the premultiplied layers for cards reused across the whole video (title, CTA);
+        a code card lasts a few frames and its ~14 MB of layers would only bloat every worker."""
+        entry = self._blend_layer_cache.get(id(card))
+        if entry is not None:
+            self._blend_layer_cache.move_to_end(id(card))
+        else:
+            rgba = np.asarray(card)
+            left, top, right, bottom = card.getchannel('A').getbbox() or (0, 0, 0, 0)
+            alpha = rgba[top:bottom, left:right, 3:4].astype(np.uint16)
+            src = rgba[top:bottom, left:right, :3] * alpha
+            # The card is kept in the entry so its id cannot be reused while cached
+            entry = (card, (left, top, right, bottom), src, 255 - alpha)
+            if cache:
+                self._blend_layer_cache[id(card)] = entry
+                if len(self._blend_layer_cache) > 4:
+                    self._blend_layer_cache.popitem(last=False)
+        _, (left, top, right, bottom), src, inv_alpha = entry
         
-        frame.paste(cta_card, (30, self.height - 270), cta_card)
-        return np.array(frame)
+        region = frame[y + top:y + bottom, x + left:x + right]
+        if HAS_NUMBA:
+            _blend_layer(region, src, inv_alpha)
+        else:
+            blended = region * inv_alpha + src + 128
+            region[:] = (blended + (blended >> 8)) >> 8
 
-    def create_video(self, day_data, audio_path, scheme):
+    def get_audio_duration(self, audio_path):
+        """Reads the MP3 duration from its header (mutagen) instead of spawning ffmpeg."""
+        if HAS_MUTAGEN:
+            try:
+                return MP3(str(audio_path)).info.length, None
+            except MutagenError as e:
+                # e.g. no MPEG sync/ID3 header; ffmpeg is more forgiving, so the voiceover is kept
+                print(f"⚠️ mutagen could not read {audio_path} ({e}); probing with ffmpeg")
+        audio = AudioFileClip(str(audio_path))
+        return audio.duration, audio
+
+    def render_frame_state(self, frame_context, state):
+        scheme, day, title, language, code_lines, output_text, duration = frame_context
+        code_progress, output_progress, show_output, t_val = state
+        return self.create_video_frame(scheme, day, title, language, code_lines, output_text,
+            code_progress, output_progress, show_output, t_val=t_val, total_duration=duration)
+
+    def create_video(self, day_data, audio_path, scheme, video_path, preset='medium', bitrate='5000k'):
+        """Renders the video and streams each frame straight into ffmpeg as it is produced."""
+        audio_input = ['-i', str(audio_path)]
         try:
-            audio = AudioFileClip(str(audio_path))
-            duration = audio.duration + 1.5 # Add 1.5s buffer for pacing
-            print(f"   Audio duration: {audio.duration:.2f}s (+1.5s buffer = {duration:.2f}s)")
+            audio_duration, audio = self.get_audio_duration(audio_path)
+            if audio:
+                audio.close()
+            duration = audio_duration + 1.5 # Add 1.5s buffer for pacing
+            print(f"   Audio duration: {audio_duration:.2f}s (+1.5s buffer = {duration:.2f}s)")
         except Exception as e:
             print(f"⚠️ Audio file issue: {e}. Creating silent clip")
             duration = 10
-            audio = AudioClip(lambda t: [0, 0], duration=duration, fps=44100)
+            audio_input = ['-f', 'lavfi', '-i', 'anullsrc=r=44100:cl=stereo']
         
         code = day_data['code']
         language = day_data.get('language', 'python')
         code_lines = code.split('\n')
+        self._chunk_cache.clear()
+        self._wrap_cache.clear()
         output_text = day_data.get('output', None)
         
         print(f"Language: {language}")
@@ -1080,51 +1679,103 @@ class YouTubeAutomation:
         code_frames = int(total_frames * 0.6)
         output_frames = int(total_frames * 0.3) if output_text else 0
         
-        frames = []
         chars_per_frame = 0.5 if code_frames > 0 else 1
-        current_line = 0
-        current_char = 0.0
-        code_progress = []
+        line_lengths = np.array([len(line) for line in code_lines], dtype=np.int64)
+        typing_states = _advance_typewriter(chars_per_frame, code_frames, line_lengths)
         
+        # Pass 1 (cheap): the typing/output state of every frame
+        frame_states = []
+        typing_position = None
         for frame_num in range(total_frames):
             
             t_val = frame_num / self.fps
 
             if frame_num < code_frames:
-                if current_line < len(code_lines):
-                    line = code_lines[current_line]
-                    if int(current_char) <= len(line):
-                        if current_line >= len(code_progress):
-                            code_progress.append('')
-                        code_progress[current_line] = line[:int(current_char)]
-                        current_char += chars_per_frame
-                    else:
-                        current_line += 1
-                        current_char = 0.0
-                frame = self.create_video_frame(scheme, day_data['day'], day_data['title'], language,
-                    code_lines, output_text, code_progress, 0, False, t_val=t_val, total_duration=duration)
+                # At 0.5 chars/frame each position holds for several frames: share one list per position
+                if tuple(typing_states[frame_num]) != typing_position:
+                    typing_position = tuple(typing_states[frame_num])
+                    started, typed = typing_position
+                    code_progress = code_lines[:started - 1] + [code_lines[started - 1][:typed]] if started else []
+                frame_states.append((code_progress, 0, False, t_val))
             elif output_text and frame_num < code_frames + output_frames:
-                code_progress = code_lines.copy()
                 output_progress = int(((frame_num - code_frames) / output_frames) * len(output_text))
-                frame = self.create_video_frame(scheme, day_data['day'], day_data['title'], language,
-                    code_lines, output_text, code_progress, output_progress, True, t_val=t_val, total_duration=duration)
+                frame_states.append((code_lines, output_progress, True, t_val))
             else:
-                code_progress = code_lines.copy()
-                frame = self.create_video_frame(scheme, day_data['day'], day_data['title'], language,
-                    code_lines, output_text, code_progress, len(output_text) if output_text else 0, bool(output_text), t_val=t_val, total_duration=duration)
-            frames.append(frame)
-            
-            # Print progress every 30 frames
-            if frame_num % 30 == 0:
-                print(f"   Rendering Frame {frame_num}/{total_frames}", end='\r')
+                frame_states.append((code_lines, len(output_text) if output_text else 0, bool(output_text), t_val))
+        
+        # Pass 2 (expensive): frames are independent given their state, so fan out across cores
+        frame_context = (scheme, day_data['day'], day_data['title'], language, code_lines, output_text, duration)
+        pool = None
+        if self.frame_workers > 1 and total_frames > 1:
+            # Not fork: a forked worker would also inherit the ffmpeg stdin pipe (so ffmpeg never sees EOF)
+            pool = ProcessPoolExecutor(max_workers=self.frame_workers, mp_context=worker_mp_context(),
+                                       initializer=_init_frame_worker, initargs=(self, frame_context))
+            rendered = render_frames_bounded(pool, frame_states, window=self.frame_workers + 1)
+        else:
+            rendered = (self.render_frame_state(frame_context, state) for state in frame_states)
         
-        def make_frame(t):
-            frame_idx = int(t * self.fps)
-            return frames[min(frame_idx, len(frames) - 1)]
+        # Audio is padded with silence and cut at the end of the video (the 1.5s buffer)
+        ffmpeg_bin = get_setting('FFMPEG_BINARY')
+        video_codec = detect_video_codec(ffmpeg_bin) if self.video_codec == 'auto' else self.video_codec
+        print(f"   Encoder: {video_codec}")
+        ffmpeg_cmd = [
+            ffmpeg_bin, '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{self.width}x{self.height}', '-r', str(self.fps), '-i', '-',
+            *audio_input,
+            '-map', '0:v', '-map', '1:a',
+            '-c:v', video_codec, '-preset', preset, '-b:v', bitrate, '-pix_fmt', 'yuv420p',
+            '-c:a', 'aac', '-ar', '44100', '-af', 'apad', '-t', f'{total_frames / self.fps:.3f}',
+            str(video_path)
+        ]
+        ffmpeg = subprocess.Popen(ffmpeg_cmd, stdin=subprocess.PIPE)
+        
+        # Pipe writes block until ffmpeg takes the frame but release the GIL, so a writer
+        # thread fed through a short queue lets the next frames render in the meantime
+        frame_queue = queue.Queue(maxsize=4)
+        write_errors = []
+        
+        def write_frames():
+            while (frame := frame_queue.get()) is not None:
+                if write_errors:
+                    continue  # keep draining so the renderer never blocks on a dead pipe
+                try:
+                    ffmpeg.stdin.write(memoryview(np.ascontiguousarray(frame)))
+                except Exception as e:
+                    write_errors.append(e)
+            try:
+                ffmpeg.stdin.close()
+            except BrokenPipeError as e:
+                write_errors.append(e)
+        
+        writer = threading.Thread(target=write_frames, daemon=True)
+        writer.start()
+        try:
+            try:
+                for frame_num, frame in enumerate(rendered):
+                    if write_errors:
+                        break
+                    frame_queue.put(frame)
+                    
+                    # Print progress every 30 frames
+                    if frame_num % 30 == 0:
+                        print(f"   Rendering Frame {frame_num}/{total_frames}", end='\r')
+            finally:
+                frame_queue.put(None)
+                writer.join()
+            if write_errors:
+                if isinstance(write_errors[0], BrokenPipeError):
+                    raise RuntimeError(f"ffmpeg ({video_codec}) exited with code {ffmpeg.wait()} while writing {video_path}")
+                raise write_errors[0]
+            if ffmpeg.wait() != 0:
+                raise RuntimeError(f"ffmpeg exited with code {ffmpeg.returncode} while writing {video_path}")
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+            if ffmpeg.poll() is None:
+                ffmpeg.kill()
+                ffmpeg.wait()
         
-        video_clip = VideoClip(make_frame, duration=duration)
-        video_clip = video_clip.set_audio(audio)
-        return video_clip
+        return video_path
 
     def generate_youtube_metadata(self, day_data):
         """Generates viral, dynamic metadata using Gemini AI or fallback templates."""
@@ -1169,8 +1820,10 @@ class YouTubeAutomation:
                  print(f"⚠️ Primary Model Generation Failed: {e}")
                  print("🔄 Switching to Fallback Model: gemini-pro")
                  import google.generativeai as genai
-                 self.genai_model = genai.GenerativeModel('gemini-pro')
-                 response = self.genai_model.generate_content(prompt)
+                 # Local only: this runs on the background metadata thread, so it must not
+                 # swap out the shared self.genai_model under the script generation calls
+                 fallback_model = genai.GenerativeModel('gemini-pro')
+                 response = fallback_model.generate_content(prompt)
 
              cleaned_text = response.text.replace('```json', '').replace('```', '').strip()
              ai_data = json.loads(cleaned_text)
@@ -1190,18 +1843,11 @@ class YouTubeAutomation:
                  description += mandatory_hashtags
                  
              # Sanitize Description - Remove patterns YouTube rejects
-             import re
-             # Remove any URL-like patterns (YouTube rejects certain URL formats)
-             description = re.sub(r'https?://[^\s]+', '', description)
-             description = re.sub(r'www\.[^\s]+', '', description)
-             # Remove angle brackets and HTML-like patterns
-             description = re.sub(r'<[^>]*>', '', description)
-             description = description.replace("<", "").replace(">", "")
-             # Remove excessive special characters that might cause issues
-             description = re.sub(r'[<>{}|\[\]\\^`]', '', description)
+             # (URL-like patterns, HTML-like tags, stray brackets and other special characters)
+             description = DESCRIPTION_WWW_RE.sub('', DESCRIPTION_URL_RE.sub('', description))
+             description = DESCRIPTION_MARKUP_RE.sub('', description)
              # Clean up any resulting double spaces or excessive newlines
-             description = re.sub(r' +', ' ', description)
-             description = re.sub(r'\n{3,}', '\n\n', description)
+             description = DESCRIPTION_SPACING_RE.sub(lambda m: ' ' if m.group(1) else '\n\n', description)
              
              print(f"   Generated Title: {title}")
              print(f"   Generated Description Length: {len(description)}")
@@ -1217,26 +1863,33 @@ class YouTubeAutomation:
              print("❌ AI Model missing but Fallback disabled by user request. Exiting.")
              raise Exception("AI Model Required for Trending Metadata")
 
+    def get_youtube_service(self):
+        """Authenticates once per run; later uploads reuse the same credentials and client."""
+        if self.youtube_service is None:
+            print("🚀 Authenticating with YouTube...")
+            credentials = google.oauth2.credentials.Credentials.from_authorized_user_info(
+                info={"client_id": self.yt_client_id, "client_secret": self.yt_client_secret, "refresh_token": self.yt_refresh_token}
+            )
+            self.youtube_service = build("youtube", "v3", credentials=credentials)
+        return self.youtube_service
+
     def upload_to_youtube(self, video_path, metadata):
         if not self.yt_refresh_token or not self.yt_client_id:
             print("⚠️ YouTube credentials missing. Skipping upload.")
             return False
         try:
-            print("🚀 Authenticating with YouTube...")
-            credentials = google.oauth2.credentials.Credentials.from_authorized_user_info(
-                info={"client_id": self.yt_client_id, "client_secret": self.yt_client_secret, "refresh_token": self.yt_refresh_token}
-            )
-            youtube = build("youtube", "v3", credentials=credentials)
+            youtube = self.get_youtube_service()
             body = {
                 "snippet": {"title": metadata["title"], "description": metadata["description"], "tags": metadata["tags"], "categoryId": metadata["category"]},
                 "status": {"privacyStatus": metadata["privacyStatus"], "selfDeclaredMadeForKids": False}
             }
             print(f"📤 Uploading: {video_path}")
-            media = MediaFileUpload(str(video_path), chunksize=-1, resumable=True)
+            # 8 MiB chunks: the file is streamed from disk and a failed chunk is retried on its own
+            media = MediaFileUpload(str(video_path), chunksize=8 * 1024 * 1024, resumable=True, mimetype='video/mp4')
             request = youtube.videos().insert(part="snippet,status", body=body, media_body=media)
             response = None
             while response is None:
-                status, response = request.next_chunk()
+                status, response = request.next_chunk(num_retries=3)
                 if status:
                     print(f"   Upload progress: {int(status.progress() * 100)}%")
             print(f"✅ Upload Complete! Video ID: {response['id']}")
@@ -1245,11 +1898,11 @@ class YouTubeAutomation:
             print(f"❌ Upload Failed: {e}")
             return False
 
-    def run_daily_automation(self, json_path="content.json"):
+    def run_daily_automation(self, json_path="content.json", max_days=1):
         print(f"📂 Loading content from {json_path}")
         data = self.load_content(json_path)
-        day_data = self.get_next_pending_day(data)
-        if not day_data:
+        days = self.get_pending_days(data, max_days)
+        if not days:
             print("⚠️ No pending videos found. Creating the next draft day automatically.")
             day_data = self.create_next_pending_day(data)
             if not day_data:
@@ -1257,9 +1910,91 @@ class YouTubeAutomation:
                 return
             self.save_content(data, json_path)
             print(f"📝 Added draft Day {day_data['day']} to {json_path}")
-
-
-        
+            days = [day_data]
+
+        self.prune_audio_cache()
+
+        # Scripts first, then kick off TTS for every day so network time overlaps rendering
+        jobs = []
+        for day_data in days:
+            script = self.generate_script(day_data)
+            lang_prefix = day_data.get('language', 'py')[:2]
+            audio_path = self.output_folder / f"{lang_prefix}_day_{day_data['day']}_audio.mp3"
+            jobs.append((script, audio_path))
+        print(f"🎙️ Generating Audio for {len(jobs)} day(s)...")
+        audio_futures = self.synthesize_audio_batch(jobs)
+        # Metadata only needs day_data, so the Gemini round-trips also run while the videos render
+        metadata_pool = ThreadPoolExecutor(max_workers=1)
+        metadata_futures = [metadata_pool.submit(self.generate_youtube_metadata, day_data) for day_data in days]
+        metadata_pool.shutdown(wait=False)
+
+        # Days are independent renders: spread them over processes when there is more than one
+        workers = min(len(days), max(1, (os.cpu_count() or 2) // 2))
+        pool = None
+        if workers > 1:
+            numba_threads = max(1, (os.cpu_count() or 2) // workers)
+            # Fewer days than cores: each day renders its frames on its share of the rest
+            self.worker_frame_workers = numba_threads
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=worker_mp_context(),
+                                       initializer=_init_day_worker, initargs=(numba_threads,))
+
+        # Uploads run on one background thread (in day order) while later days are still rendering
+        uploader = ThreadPoolExecutor(max_workers=1)
+        published = None
+        try:
+            renders = []
+            for day_data, (script, audio_path), audio_future, metadata in zip(days, jobs, audio_futures, metadata_futures):
+                scheme = self.prepare_day(day_data, audio_path, audio_future)
+                lang_prefix = day_data.get('language', 'py')[:2]
+                video_path = self.output_folder / f"{lang_prefix}_day_{day_data['day']}_shorts.mp4"
+                if pool:
+                    renders.append((day_data, video_path, metadata, pool.submit(self.render_video_file, day_data, audio_path, scheme, video_path)))
+                else:
+                    self.render_video_file(day_data, audio_path, scheme, video_path)
+                    published = uploader.submit(self.publish_after, published, data, json_path, day_data, video_path, metadata)
+
+            for day_data, video_path, metadata, render in renders:
+                render.result()
+                published = uploader.submit(self.publish_after, published, data, json_path, day_data, video_path, metadata)
+            if published:
+                published.result()
+        finally:
+            uploader.shutdown(wait=True)
+            if pool:
+                pool.shutdown(cancel_futures=True)
+                self.worker_frame_workers = 1
+
+    def publish_after(self, previous, data, json_path, day_data, video_path, metadata_future=None):
+        if previous:
+            previous.result()  # A failed upload stops the days queued behind it
+        metadata = metadata_future.result() if metadata_future else None
+        self.publish_day(data, json_path, day_data, video_path, metadata)
+
+    def __getstate__(self):
+        # Render workers only need drawing state; the AI client and card caches stay in this process
+        state = self.__dict__.copy()
+        state.pop('genai_model', None)
+        state['youtube_service'] = None
+        state['has_ai'] = False
+        # A pickled copy is already a worker: a day worker gets its share of the cores for frames,
+        # and a frame worker (pickled by a day worker or the main process) no frame pool at all
+        state['frame_workers'] = self.worker_frame_workers
+        state['worker_frame_workers'] = 1
+        state['_static_layer_cache'] = {}
+        state['_code_card_cache'] = OrderedDict()
+        state['_code_base_cache'] = OrderedDict()
+        state['_blend_layer_cache'] = OrderedDict()
+        state['_chunk_cache'] = {}
+        state['_wrap_cache'] = {}
+        state.pop('_quota_lock', None)
+        state['_quota_check_locks'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._quota_lock = threading.Lock()
+
+    def prepare_day(self, day_data, audio_path, audio_future):
         print(f"\n{'='*50}")
         print(f"🔥 Processing Day {day_data['day']}: {day_data['title']}")
         print(f"{'='*50}")
@@ -1269,27 +2004,20 @@ class YouTubeAutomation:
         scheme = self.generate_dynamic_theme(day_data['title'])
         print(f"   Theme: {scheme.get('name', 'custom')}")
         
-        script = self.generate_script(day_data)
-        lang_prefix = day_data.get('language', 'py')[:2]
-        audio_path = self.output_folder / f"{lang_prefix}_day_{day_data['day']}_audio.mp3"
-        print("🎙️ Generating Audio...")
-        
-        if not self.text_to_speech_elevenlabs(script, str(audio_path)):
+        if not audio_future.result():
             print("⚠️ Audio generation failed or no keys available. Creating silent fallback.")
-            from moviepy.audio.AudioClip import AudioArrayClip
-            import numpy as np
-            duration = 10
-            silence = np.zeros((int(duration * 44100), 2))
-            silent_clip = AudioArrayClip(silence, fps=44100)
-            silent_clip.write_audiofile(str(audio_path), fps=44100)
-        
-        print("🎥 Generating Video...")
+            self.write_silent_audio(audio_path)
+        return scheme
+
+    def render_video_file(self, day_data, audio_path, scheme, video_path):
+        print(f"🎥 Generating Video for Day {day_data['day']}...")
         time.sleep(1)
-        video = self.create_video(day_data, audio_path, scheme)
-        video_path = self.output_folder / f"{lang_prefix}_day_{day_data['day']}_shorts.mp4"
-        video.write_videofile(str(video_path), fps=self.fps, codec='libx264', audio_codec='aac', preset='medium', bitrate='5000k', audio_fps=44100)
-        
-        metadata = self.generate_youtube_metadata(day_data)
+        return self.create_video(day_data, audio_path, scheme, video_path)
+
+    def publish_day(self, data, json_path, day_data, video_path, metadata=None):
+        lang_prefix = day_data.get('language', 'py')[:2]
+        if metadata is None:
+            metadata = self.generate_youtube_metadata(day_data)
         with open(self.output_folder / f"{lang_prefix}_day_{day_data['day']}_metadata.json", 'w', encoding='utf-8') as f:
             json.dump(metadata, f, indent=2, ensure_ascii=False)
 
@@ -1306,4 +2034,6 @@ class YouTubeAutomation:
 
 if __name__ == "__main__":
     automation = YouTubeAutomation()
-    automation.run_daily_automation("content.json")
+    # MAX_DAYS > 1 batches several pending days into one run (TTS for all of them overlaps rendering)
+    max_days = int(os.getenv('MAX_DAYS', '1').strip() or 1)
+    automation.run_daily_automation("content.json", max_days=max_days)